@@ -339,7 +339,7 @@ class RazerDaemon(DBusService):
                 self._persistence[device.dbus.storage_name]['poll_rate'] = str(device.dbus.poll_rate)
 
             for i in device.dbus.ZONES:
-                if device.dbus.zone[i]["present"]:
+                if i in device.dbus.zone and device.dbus.zone[i]["present"]:
                     self._persistence[device.dbus.storage_name][i + '_active'] = str(device.dbus.zone[i]["active"])
                     self._persistence[device.dbus.storage_name][i + '_brightness'] = str(device.dbus.zone[i]["brightness"])
                     self._persistence[device.dbus.storage_name][i + '_effect'] = device.dbus.zone[i]["effect"]
@@ -3,12 +3,17 @@
 """
 Hardware base class
 """
-import configparser
+import collections
+import contextlib
+import functools
 import re
 import os
 import types
+import weakref
 import inspect
 import logging
+import operator
+import threading
 import time
 import json
 
@@ -17,6 +22,313 @@ import openrazer_daemon.dbus_services.dbus_methods
 from openrazer_daemon.misc import effect_sync
 from openrazer_daemon.misc.battery_notifier import BatteryManager as _BatteryManager
 
+# Serial numbers not matching this are replaced with a generated one
+_SERIAL_RE = re.compile(r"[\dA-Z]+")
+# Characters of the usual serial numbers, checked before falling back to the regex
+_SERIAL_CHARS = frozenset('0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+
+# Values configparser treats as True for a boolean option
+_TRUTHY = frozenset(('1', 'yes', 'true', 'on'))
+
+# Device mode ID and parameter to payload for set_device_mode()
+_MODE_PAYLOADS = {
+    (0, 0): b'\x00\x00',  # Device mode
+    (3, 0): b'\x03\x00',  # Driver mode
+}
+
+# Default zone colors. Each zone gets its own list copy, as the
+# dbus_methods modules update the colors in place.
+_DEFAULT_COLORS = (0, 255, 0, 0, 255, 255, 0, 0, 255)
+
+
+def _has_zone_methods(methods, zone):
+    """
+    Check if there are LED methods for a zone
+
+    :param methods: Method names
+    :type methods: frozenset
+
+    :param zone: Zone
+    :type zone: str
+
+    :return: True if the zone has methods
+    :rtype: bool
+    """
+    return 'set_' + zone + '_static_classic' in methods \
+        or 'set_' + zone + '_static' in methods \
+        or 'set_' + zone + '_active' in methods \
+        or 'set_' + zone + '_on' in methods
+
+
+def _load_section(persistence, section):
+    """
+    Get a snapshot of a persistence section
+
+    Going through the ConfigParser for every single key is comparatively
+    slow, so all raw values of the section are read at once.
+
+    :param persistence: Persistence
+    :type persistence: configparser.ConfigParser
+
+    :param section: Section name
+    :type section: str
+
+    :return: Values of the section or None if there's no such section
+    :rtype: dict or None
+    """
+    if not persistence.has_section(section):
+        return None
+
+    return dict(persistence.items(section, raw=True))
+
+
+def _parse_colors(value):
+    """
+    Parse the zone colors stored in the persistence file
+
+    :param value: Exactly 9 numbers from 0 to 255, separated with spaces
+    :type value: str
+
+    :return: Colors
+    :rtype: list of int
+
+    :raises ValueError: If the colors are invalid
+    """
+    colors = [int(item) for item in value.split()]
+
+    # check if we have exactly 9 colors
+    if len(colors) != 9:
+        raise ValueError('There must be exactly 9 colors')
+
+    # check if the colors are in range
+    if min(colors) < 0 or max(colors) > 255:
+        raise ValueError('Color out of range')
+
+    return colors
+
+
+# Names of the methods used to restore the state of a zone
+_ZoneNames = collections.namedtuple('_ZoneNames', ('active_func_name', 'bright_func_name', 'effect_prefix'))
+
+# DBus interface and method name prefix of the effect getters of each zone
+_EFFECT_GETTER_INTERFACES = {
+    # Intentionally using the same underlying methods as the backlight effect getters in razer.device.lighting.chroma.
+    # Both refer to the 'backlight' LED internally but partially exist separately due to historical reasons.
+    'backlight': ('razer.device.lighting.backlight', 'Backlight'),
+    'logo': ('razer.device.lighting.logo', 'Logo'),
+    'scroll': ('razer.device.lighting.scroll', 'Scroll'),
+    'left': ('razer.device.lighting.left', 'Left'),
+    'right': ('razer.device.lighting.right', 'Right'),
+    'charging': ('razer.device.lighting.charging', 'Charging'),
+    'fast_charging': ('razer.device.lighting.fast_charging', 'FastCharging'),
+    'fully_charged': ('razer.device.lighting.fully_charged', 'FullyCharged'),
+}
+
+# DBus method name suffix, getter name suffix, zone state key and out signature of the effect getters
+_EFFECT_GETTERS = (
+    ('Effect', 'effect', 'effect', 's'),
+    ('EffectColors', 'effect_colors', 'colors', 'ay'),
+    ('EffectSpeed', 'effect_speed', 'speed', 'i'),
+    ('WaveDir', 'wave_dir', 'wave_dir', 'i'),
+)
+
+
+class _ZoneState:
+    """
+    State of a single zone of a device
+
+    Also supports dict-like access, e.g. zone["effect"], as used
+    throughout the dbus_methods modules
+    """
+    # "size" is only set for the ARGB channels
+    __slots__ = ('present', 'active', 'brightness', 'effect', 'colors', 'speed', 'wave_dir', 'size')
+    _KEYS = frozenset(__slots__)
+
+    def __init__(self):
+        self.present = False
+        self.active = True
+        self.brightness = 75.0
+        self.effect = 'spectrum'
+        self.colors = list(_DEFAULT_COLORS)
+        self.speed = 1
+        self.wave_dir = 1
+
+    def __getitem__(self, key):
+        if key in self._KEYS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __repr__(self):
+        return repr({key: getattr(self, key) for key in self.__slots__ if hasattr(self, key)})
+
+
+class _ZoneMap(dict):
+    """
+    Dict of zone to _ZoneState, which sets up the default state of a zone on first access
+    """
+
+    def __init__(self, zones):
+        """
+        :param zones: All possible zones
+        :type zones: tuple of str
+        """
+        super().__init__()
+        self._zones = zones
+
+    def __missing__(self, zone):
+        if zone not in self._zones:
+            raise KeyError(zone)
+
+        zone_state = self[zone] = _ZoneState()
+        return zone_state
+
+
+# How to restore an effect: the effect method, a function returning its
+# arguments from the zone state (None to skip it) and an error to log
+_EffectEntry = collections.namedtuple('_EffectEntry', ('func_name', 'get_args', 'error'))
+
+# Effect arguments by number of arguments of the effect method
+_EFFECT_ARGS = {
+    0: lambda zone: (),
+    3: lambda zone: tuple(zone.colors[0:3]),
+    6: lambda zone: tuple(zone.colors[0:6]),
+    7: lambda zone: (*zone.colors[0:6], zone.speed),
+    9: lambda zone: tuple(zone.colors[0:9]),
+}
+
+# Effect arguments for effects that share an argument count but take different arguments
+_EFFECT_ARGS_BY_NAME = {
+    # there are 2 effects which require 1 argument.
+    # these are: Starlight (Random) and Wave.
+    (1, 'starlightRandom'): lambda zone: (zone.speed,),
+    (1, 'wave'): lambda zone: (zone.wave_dir,),
+    (1, 'wheel'): lambda zone: (zone.wave_dir,),
+    # do nothing. this is handled in the ripple manager.
+    (1, 'rippleRandomColour'): None,
+    # starlight/reactive have different arguments.
+    (4, 'starlightSingle'): lambda zone: (*zone.colors[0:3], zone.speed),
+    (4, 'reactive'): lambda zone: (*zone.colors[0:3], zone.speed),
+    # do nothing. this is handled in the ripple manager.
+    (4, 'ripple'): None,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _get_dbus_endpoints():
+    """
+    Get the DBus endpoints of the dbus_methods modules
+
+    The modules don't change at runtime, so they are only scanned once.
+
+    :return: Dict of function name to function
+    :rtype: dict
+    """
+    available_functions = {}
+    for potential_function in vars(openrazer_daemon.dbus_services.dbus_methods).values():
+        # the submodules have an endpoint attribute too (the imported decorator)
+        if isinstance(potential_function, types.FunctionType) and getattr(potential_function, 'endpoint', False):
+            available_functions[potential_function.__name__] = potential_function
+
+    return available_functions
+
+
+def _finalize_device(driver_fds, driver_fds_lock, device_path):
+    """
+    Clean up after a device, used by RazerDevice.close() and when a device is garbage collected
+
+    This must not reference the device itself, see weakref.finalize.
+
+    :param driver_fds: Driver filename to fd of the open driver files
+    :type driver_fds: dict
+
+    :param driver_fds_lock: Lock for driver_fds
+    :type driver_fds_lock: threading.Lock
+
+    :param device_path: Device path
+    :type device_path: str
+    """
+    with driver_fds_lock:
+        for driver_fd in driver_fds.values():
+            try:
+                os.close(driver_fd)
+            except OSError:
+                pass
+        driver_fds.clear()
+
+    # A new device can show up with the same path later on
+    RazerDevice._SERIAL_CACHE.pop(device_path, None)
+
+
+# Set OPENRAZER_PROFILE to profile device setup and effect restoring
+_PROFILE = bool(os.environ.get('OPENRAZER_PROFILE'))
+# Private directory for the profile stats, created on first use
+_profile_dir = None
+# Profile stats by device number
+_PROFILE_STATS = {}
+_profile_active = False
+
+
+def _profiled(func):
+    """
+    Decorator which profiles a RazerDevice method when profiling is enabled
+
+    The stats of every call are added up per device and written to
+    device<number>.pstats in a private temporary directory after each call.
+    The directory is logged when it is created.
+
+    :param func: Method
+    :type func: callable
+
+    :return: Wrapped method, or the method itself when profiling is disabled
+    :rtype: callable
+    """
+    if not _PROFILE:
+        return func
+
+    # Only imported when profiling, so a normal start doesn't pay for them
+    import cProfile  # pylint: disable=import-outside-toplevel
+    import pstats  # pylint: disable=import-outside-toplevel
+    import tempfile  # pylint: disable=import-outside-toplevel
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        global _profile_active, _profile_dir  # pylint: disable=global-statement
+
+        # Already covered by the outer call, e.g. restore_effect() during __init__()
+        if _profile_active:
+            return func(self, *args, **kwargs)
+
+        profiler = cProfile.Profile()
+        _profile_active = True
+        profiler.enable()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            profiler.disable()
+            _profile_active = False
+
+            if _profile_dir is None:
+                _profile_dir = tempfile.mkdtemp(prefix='openrazer-profile-')
+                self.logger.info("Writing profile stats to %s", _profile_dir)
+
+            device_number = getattr(self, '_device_number', None)
+            stats = _PROFILE_STATS.get(device_number)
+            if stats is None:
+                stats = _PROFILE_STATS[device_number] = pstats.Stats(profiler)
+            else:
+                stats.add(profiler)
+            stats.dump_stats(os.path.join(_profile_dir, 'device{0}.pstats'.format(device_number)))
+
+    return wrapper
+
 
 # pylint: disable=too-many-instance-attributes
 # pylint: disable=E1102
@@ -29,8 +341,17 @@ class RazerDevice(DBusService):
     """
     OBJECT_PATH = '/org/razer/device/'
     METHODS = []
+    # METHODS as frozenset for fast membership checks, set up for every subclass
+    _METHOD_SET = frozenset()
+    # Zones the device has, set up for every subclass
+    _ACTIVE_ZONES = ()
+    # Zone to capitalized zone, with and without underscores, set up for every subclass
+    _CAP_ZONE = {}
+    _UND_CAP_ZONE = {}
 
     EVENT_FILE_REGEX = None
+    # Compiled from USB_VID and USB_PID, set up for every subclass
+    _DEVICE_ID_RE = None
 
     USB_VID = None
     USB_PID = None
@@ -45,11 +366,47 @@ class RazerDevice(DBusService):
 
     ZONES = ('backlight', 'logo', 'scroll', 'left', 'right', 'charging', 'fast_charging', 'fully_charged', 'channel1', 'channel2', 'channel3', 'channel4', 'channel5', 'channel6')
 
+    # dbus.service.Object instances have a __dict__ anyway, this covers
+    # the attributes set up in __init__
+    __slots__ = ('_observer_list', '_effect_sync_propagate_up', '_disable_notifications', '_disable_persistence',
+                 'additional_interfaces', '_battery_manager', 'config', 'persistence', '_testing', '_parent',
+                 '_device_path', '_device_path_prefix', '_device_number', 'logger', '_debug_logging', '_serial', 'storage_name', 'serial',
+                 'zone', 'dpi', 'poll_rate', '_effect_sync', '_is_closed', '_driver_fds', '_driver_fds_lock', '_finalizer', 'methods_internal',
+                 'event_files', 'suspend_args', 'method_args') + tuple('_zone_' + i for i in ZONES)
+
     DEVICE_IMAGE = None
 
+    # Device path to serial, so it's only read from the driver once per device
+    _SERIAL_CACHE = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        cls._METHOD_SET = frozenset(cls.METHODS)
+
+        # this check is separate from the rest because backlight effects don't have prefixes in their names
+        has_backlight = 'set_static_effect' in cls._METHOD_SET or 'bw_set_static' in cls._METHOD_SET
+        cls._ACTIVE_ZONES = tuple(i for i in cls.ZONES if (i == "backlight" and has_backlight) or _has_zone_methods(cls._METHOD_SET, i))
+
+        cls._CAP_ZONE = {i: cls.capitalize_first_char(i) for i in cls.ZONES}
+        cls._UND_CAP_ZONE = {i: cls.handle_underscores(capitalized) for i, capitalized in cls._CAP_ZONE.items()}
+
+        # Device ID regex for match(), intermediate classes don't have a VID/PID
+        if cls.USB_VID is not None and cls.USB_PID is not None:
+            cls._DEVICE_ID_RE = re.compile(r'^[0-9A-F]{4}:' + '{0:04X}'.format(cls.USB_VID) + ':' + '{0:04X}'.format(cls.USB_PID) + r'\.[0-9A-F]{4}$')
+        else:
+            cls._DEVICE_ID_RE = None
+
+        # Allow subclasses to specify the event file regex as a plain string
+        if isinstance(cls.__dict__.get('EVENT_FILE_REGEX'), str):
+            cls.EVENT_FILE_REGEX = re.compile(cls.EVENT_FILE_REGEX)
+
+    @_profiled
     def __init__(self, device_path, device_number, config, persistence, testing, additional_interfaces, additional_methods, unknown_serial_counter):
 
         self.logger = logging.getLogger('razer.device{0}'.format(device_number))
+        # Skip debug messages in frequently called methods early if they won't be logged anyway
+        self._debug_logging = self.logger.isEnabledFor(logging.DEBUG)
         self.logger.info("Initialising device.%d %s", device_number, self.__class__.__name__)
 
         # Serial cache
@@ -61,7 +418,8 @@ class RazerDevice(DBusService):
         # Local storage key name
         self.storage_name = "UnknownDevice"
 
-        self._observer_list = []
+        # Dict as ordered set, the values are unused
+        self._observer_list = {}
         self._effect_sync_propagate_up = False
         self._disable_notifications = False
         self._disable_persistence = False
@@ -75,6 +433,8 @@ class RazerDevice(DBusService):
         self._testing = testing
         self._parent = None
         self._device_path = device_path
+        # Driver file paths are built from this, see get_driver_path()
+        self._device_path_prefix = os.path.join(device_path, '')
         self._device_number = device_number
         self.serial = self.get_serial()
 
@@ -91,33 +451,37 @@ class RazerDevice(DBusService):
         else:
             self.storage_name = self.serial
 
-        self.zone = dict()
-
-        for i in self.ZONES:
-            self.zone[i] = {
-                "present": False,
-                "active": True,
-                "brightness": 75.0,
-                "effect": 'spectrum',
-                "colors": [0, 255, 0, 0, 255, 255, 0, 0, 255],
-                "speed": 1,
-                "wave_dir": 1,
-            }
+        # Only the zones the device has are set up here, also as _zone_<zone>
+        # attributes. Any other zone gets its default state when it is first
+        # accessed through self.zone.
+        self.zone = _ZoneMap(self.ZONES)
+        for i in self._ACTIVE_ZONES:
+            zone_state = self.zone[i]
+            zone_state.present = True
+            setattr(self, '_zone_' + i, zone_state)
 
         # Check for a DPI X only device since they need a Y value of 0
-        if 'available_dpi' in self.METHODS:
+        if 'available_dpi' in self._METHOD_SET:
             self.dpi = [1800, 0]
         else:
             self.dpi = [1800, 1800]
 
         self.poll_rate = 500
-        if 'set_poll_rate' in self.METHODS and not self.POLL_RATES:
+        if 'set_poll_rate' in self._METHOD_SET and not self.POLL_RATES:
             self.POLL_RATES = [125, 500, 1000]
 
         self._effect_sync = effect_sync.EffectSync(self, device_number)
 
         self._is_closed = False
 
+        # Driver filename to fd of the driver files written for every frame,
+        # these are written from e.g. the ripple thread too
+        self._driver_fds = {}
+        self._driver_fds_lock = threading.Lock()
+
+        # Clean up if the device gets garbage collected without being closed
+        self._finalizer = weakref.finalize(self, _finalize_device, self._driver_fds, self._driver_fds_lock, device_path)
+
         # device methods available in all devices
         self.methods_internal = ['get_firmware', 'get_matrix_dims', 'has_matrix', 'get_device_name']
         self.methods_internal.extend(additional_methods)
@@ -130,10 +494,9 @@ class RazerDevice(DBusService):
         else:
             search_dir = '/dev/input/by-id/'
 
-        if os.path.exists(search_dir):
-            for event_file in os.listdir(search_dir):
-                if self.EVENT_FILE_REGEX is not None and self.EVENT_FILE_REGEX.match(event_file) is not None:
-                    self.event_files.append(os.path.join(search_dir, event_file))
+        if self.EVENT_FILE_REGEX is not None and os.path.exists(search_dir):
+            with os.scandir(search_dir) as event_files:
+                self.event_files = [event_file.path for event_file in event_files if self.EVENT_FILE_REGEX.match(event_file.name) is not None]
 
         object_path = os.path.join(self.OBJECT_PATH, self.serial)
         super().__init__(object_path)
@@ -159,168 +522,87 @@ class RazerDevice(DBusService):
             ('razer.device.lighting.chroma', 'restoreLastEffect', self.restore_effect, None, None),
         }
 
-        effect_methods = {
-            "backlight_chroma": {
-                ('razer.device.lighting.chroma', 'getEffect', self.get_current_effect, None, 's'),
-                ('razer.device.lighting.chroma', 'getEffectColors', self.get_current_effect_colors, None, 'ay'),
-                ('razer.device.lighting.chroma', 'getEffectSpeed', self.get_current_effect_speed, None, 'i'),
-                ('razer.device.lighting.chroma', 'getWaveDir', self.get_current_wave_dir, None, 'i'),
-            },
-
-            "backlight": {
-                # Intentionally using the same underlying methods as backlight_chroma.
-                # Both refer to the 'backlight' LED internally but partially exist separately due to historical reasons.
-                ('razer.device.lighting.backlight', 'getBacklightEffect', self.get_current_effect, None, 's'),
-                ('razer.device.lighting.backlight', 'getBacklightEffectColors', self.get_current_effect_colors, None, 'ay'),
-                ('razer.device.lighting.backlight', 'getBacklightEffectSpeed', self.get_current_effect_speed, None, 'i'),
-                ('razer.device.lighting.backlight', 'getBacklightWaveDir', self.get_current_wave_dir, None, 'i'),
-            },
-
-            "logo": {
-                ('razer.device.lighting.logo', 'getLogoEffect', self.get_current_logo_effect, None, 's'),
-                ('razer.device.lighting.logo', 'getLogoEffectColors', self.get_current_logo_effect_colors, None, 'ay'),
-                ('razer.device.lighting.logo', 'getLogoEffectSpeed', self.get_current_logo_effect_speed, None, 'i'),
-                ('razer.device.lighting.logo', 'getLogoWaveDir', self.get_current_logo_wave_dir, None, 'i'),
-            },
-
-            "scroll": {
-                ('razer.device.lighting.scroll', 'getScrollEffect', self.get_current_scroll_effect, None, 's'),
-                ('razer.device.lighting.scroll', 'getScrollEffectColors', self.get_current_scroll_effect_colors, None, 'ay'),
-                ('razer.device.lighting.scroll', 'getScrollEffectSpeed', self.get_current_scroll_effect_speed, None, 'i'),
-                ('razer.device.lighting.scroll', 'getScrollWaveDir', self.get_current_scroll_wave_dir, None, 'i'),
-            },
-
-            "left": {
-                ('razer.device.lighting.left', 'getLeftEffect', self.get_current_left_effect, None, 's'),
-                ('razer.device.lighting.left', 'getLeftEffectColors', self.get_current_left_effect_colors, None, 'ay'),
-                ('razer.device.lighting.left', 'getLeftEffectSpeed', self.get_current_left_effect_speed, None, 'i'),
-                ('razer.device.lighting.left', 'getLeftWaveDir', self.get_current_left_wave_dir, None, 'i'),
-            },
-
-            "right": {
-                ('razer.device.lighting.right', 'getRightEffect', self.get_current_right_effect, None, 's'),
-                ('razer.device.lighting.right', 'getRightEffectColors', self.get_current_right_effect_colors, None, 'ay'),
-                ('razer.device.lighting.right', 'getRightEffectSpeed', self.get_current_right_effect_speed, None, 'i'),
-                ('razer.device.lighting.right', 'getRightWaveDir', self.get_current_right_wave_dir, None, 'i'),
-            },
-
-            "charging": {
-                ('razer.device.lighting.charging', 'getChargingEffect', self.get_current_charging_effect, None, 's'),
-                ('razer.device.lighting.charging', 'getChargingEffectColors', self.get_current_charging_effect_colors, None, 'ay'),
-                ('razer.device.lighting.charging', 'getChargingEffectSpeed', self.get_current_charging_effect_speed, None, 'i'),
-                ('razer.device.lighting.charging', 'getChargingWaveDir', self.get_current_charging_wave_dir, None, 'i'),
-            },
-
-            "fast_charging": {
-                ('razer.device.lighting.fast_charging', 'getFastChargingEffect', self.get_current_fast_charging_effect, None, 's'),
-                ('razer.device.lighting.fast_charging', 'getFastChargingEffectColors', self.get_current_fast_charging_effect_colors, None, 'ay'),
-                ('razer.device.lighting.fast_charging', 'getFastChargingEffectSpeed', self.get_current_fast_charging_effect_speed, None, 'i'),
-                ('razer.device.lighting.fast_charging', 'getFastChargingWaveDir', self.get_current_fast_charging_wave_dir, None, 'i'),
-            },
-
-            "fully_charged": {
-                ('razer.device.lighting.fully_charged', 'getFullyChargedEffect', self.get_current_fully_charged_effect, None, 's'),
-                ('razer.device.lighting.fully_charged', 'getFullyChargedEffectColors', self.get_current_fully_charged_effect_colors, None, 'ay'),
-                ('razer.device.lighting.fully_charged', 'getFullyChargedEffectSpeed', self.get_current_fully_charged_effect_speed, None, 'i'),
-                ('razer.device.lighting.fully_charged', 'getFullyChargedWaveDir', self.get_current_fully_charged_wave_dir, None, 'i'),
-            }
-        }
-
         for m in methods:
-            self.logger.debug("Adding {}.{} method to DBus".format(m[0], m[1]))
+            if self._debug_logging:
+                self.logger.debug("Adding %s.%s method to DBus", m[0], m[1])
             self.add_dbus_method(m[0], m[1], m[2], in_signature=m[3], out_signature=m[4])
 
         # this check is separate from the rest because backlight effects don't have prefixes in their names
-        if 'set_static_effect' in self.METHODS or 'bw_set_static' in self.METHODS:
-            self.zone["backlight"]["present"] = True
-            for m in effect_methods["backlight_chroma"]:
-                self.logger.debug("Adding {}.{} method to DBus".format(m[0], m[1]))
-                self.add_dbus_method(m[0], m[1], m[2], in_signature=m[3], out_signature=m[4])
+        if 'set_static_effect' in self._METHOD_SET or 'bw_set_static' in self._METHOD_SET:
+            self._add_effect_getters("backlight", 'razer.device.lighting.chroma', '')
 
         for i in self.ZONES:
-            if 'set_' + i + '_static_classic' in self.METHODS \
-                    or 'set_' + i + '_static' in self.METHODS \
-                    or 'set_' + i + '_active' in self.METHODS \
-                    or 'set_' + i + '_on' in self.METHODS:
-                self.zone[i]["present"] = True
-                for m in effect_methods[i]:
-                    self.logger.debug("Adding {}.{} method to DBus".format(m[0], m[1]))
-                    self.add_dbus_method(m[0], m[1], m[2], in_signature=m[3], out_signature=m[4])
+            if i in _EFFECT_GETTER_INTERFACES and _has_zone_methods(self._METHOD_SET, i):
+                self._add_effect_getters(i, *_EFFECT_GETTER_INTERFACES[i])
 
         # Load additional DBus methods
         self.load_methods()
 
+        sect = _load_section(self.persistence, self.storage_name)
+
         # load last DPI/poll rate state
-        if self.persistence.has_section(self.storage_name):
-            if 'set_dpi_xy' in self.METHODS or 'set_dpi_xy_byte' in self.METHODS:
+        if sect is not None:
+            if 'set_dpi_xy' in self._METHOD_SET or 'set_dpi_xy_byte' in self._METHOD_SET:
                 try:
-                    self.dpi[0] = int(self.persistence[self.storage_name]['dpi_x'])
-                    self.dpi[1] = int(self.persistence[self.storage_name]['dpi_y'])
-                except (KeyError, configparser.NoOptionError):
+                    self.dpi[0] = int(sect['dpi_x'])
+                    self.dpi[1] = int(sect['dpi_y'])
+                except KeyError:
                     self.logger.info("Failed to get DPI from persistence storage, using default.")
 
-            if 'set_poll_rate' in self.METHODS:
+            if 'set_poll_rate' in self._METHOD_SET:
                 try:
-                    self.poll_rate = int(self.persistence[self.storage_name]['poll_rate'])
-                except (KeyError, configparser.NoOptionError):
+                    self.poll_rate = int(sect['poll_rate'])
+                except KeyError:
                     self.logger.info("Failed to get poll rate from persistence storage, using default.")
 
         # load last effects
-        for i in self.ZONES:
-            if self.zone[i]["present"]:
-                # check if we have the device in the persistence file
-                if self.persistence.has_section(self.storage_name):
-                    # try reading the effect name from the persistence
-                    try:
-                        self.zone[i]["effect"] = self.persistence[self.storage_name][i + '_effect']
-                    except (KeyError, configparser.NoOptionError):
-                        self.logger.info("Failed to get " + i + " effect from persistence storage, using default.")
-
-                    # zone active status
-                    try:
-                        self.zone[i]["active"] = self.persistence.getboolean(self.storage_name, i + '_active')
-                    except (KeyError, configparser.NoOptionError):
-                        self.logger.info("Failed to get " + i + " active from persistence storage, using default.")
+        for i in self._ACTIVE_ZONES:
+            # check if we have the device in the persistence file
+            if sect is not None:
+                # try reading the effect name from the persistence
+                try:
+                    self.zone[i]["effect"] = sect[i + '_effect']
+                except KeyError:
+                    self.logger.info("Failed to get " + i + " effect from persistence storage, using default.")
+
+                # zone active status
+                active = sect.get(i + '_active')
+                if active is not None:
+                    self.zone[i]["active"] = active.lower() in _TRUTHY
+                else:
+                    self.logger.info("Failed to get " + i + " active from persistence storage, using default.")
 
-                    # brightness
-                    try:
-                        self.zone[i]["brightness"] = float(self.persistence[self.storage_name][i + '_brightness'])
-                    except (KeyError, configparser.NoOptionError):
-                        self.logger.info("Failed to get " + i + " brightness from persistence storage, using default.")
+                # brightness
+                try:
+                    self.zone[i]["brightness"] = float(sect[i + '_brightness'])
+                except KeyError:
+                    self.logger.info("Failed to get " + i + " brightness from persistence storage, using default.")
 
-                    # colors.
-                    # these are stored as a string that must contain 9 numbers, separated with spaces.
-                    try:
-                        for index, item in enumerate(self.persistence[self.storage_name][i + '_colors'].split(" ")):
-                            self.zone[i]["colors"][index] = int(item)
-                            # check if the color is in range
-                            if not 0 <= self.zone[i]["colors"][index] <= 255:
-                                raise ValueError('Color out of range')
-
-                        # check if we have exactly 9 colors
-                        if len(self.zone[i]["colors"]) != 9:
-                            raise ValueError('There must be exactly 9 colors')
-                    except ValueError:
-                        # invalid colors. reinitialize
-                        self.zone[i]["colors"] = [0, 255, 0, 0, 255, 255, 0, 0, 255]
-                        self.logger.info("%s: Invalid colors; restoring to defaults.", self.__class__.__name__)
-                    except (KeyError, configparser.NoOptionError):
-                        self.logger.info("Failed to get " + i + " colors from persistence storage, using default.")
-
-                    # speed
-                    try:
-                        self.zone[i]["speed"] = int(self.persistence[self.storage_name][i + '_speed'])
-                    except (KeyError, configparser.NoOptionError):
-                        self.logger.info("Failed to get " + i + " speed from persistence storage, using default.")
+                # colors.
+                # these are stored as a string that must contain 9 numbers, separated with spaces.
+                try:
+                    self.zone[i]["colors"] = _parse_colors(sect[i + '_colors'])
+                except ValueError:
+                    # invalid colors. reinitialize
+                    self.zone[i]["colors"] = list(_DEFAULT_COLORS)
+                    self.logger.info("%s: Invalid colors; restoring to defaults.", self.__class__.__name__)
+                except KeyError:
+                    self.logger.info("Failed to get " + i + " colors from persistence storage, using default.")
+
+                # speed
+                try:
+                    self.zone[i]["speed"] = int(sect[i + '_speed'])
+                except KeyError:
+                    self.logger.info("Failed to get " + i + " speed from persistence storage, using default.")
 
-                    # wave direction
-                    try:
-                        self.zone[i]["wave_dir"] = int(self.persistence[self.storage_name][i + '_wave_dir'])
-                    except (KeyError, configparser.NoOptionError):
-                        self.logger.info("Failed to get " + i + " wave direction from persistence storage, using default.")
+                # wave direction
+                try:
+                    self.zone[i]["wave_dir"] = int(sect[i + '_wave_dir'])
+                except KeyError:
+                    self.logger.info("Failed to get " + i + " wave direction from persistence storage, using default.")
 
         # Initialize battery manager if the device has support
-        if 'get_battery' in self.METHODS:
+        if 'get_battery' in self._METHOD_SET:
             self._init_battery_manager()
 
         if self.DRIVER_MODE:
@@ -338,6 +620,25 @@ class RazerDevice(DBusService):
                 self.logger.debug("Restoring effect persistence again (dual boot quirk)")
                 self.restore_effect()
 
+    def _add_effect_getters(self, zone, interface_name, method_prefix):
+        """
+        Add the DBus methods returning the current effect state of a zone
+
+        :param zone: Zone
+        :type zone: str
+
+        :param interface_name: DBus interface name
+        :type interface_name: str
+
+        :param method_prefix: Prefix of the DBus method names, e.g. Logo for getLogoEffect
+        :type method_prefix: str
+        """
+        for method_suffix, getter_suffix, _, out_signature in _EFFECT_GETTERS:
+            method_name = 'get' + method_prefix + method_suffix
+            if self._debug_logging:
+                self.logger.debug("Adding %s.%s method to DBus", interface_name, method_name)
+            self.add_dbus_method(interface_name, method_name, getattr(self, _effect_getter_name(zone, getter_suffix)), out_signature=out_signature)
+
     def send_effect_event(self, effect_name, *args):
         """
         Send effect event
@@ -393,46 +694,31 @@ class RazerDevice(DBusService):
 
         This is used at launch time.
         """
-        for i in self.ZONES:
-            if self.zone[i]["present"]:
-                # load active state
-                if 'set_' + i + '_active' in self.METHODS:
-                    active_func = getattr(self, "set" + self.capitalize_first_char(i) + "Active", None)
-                    if active_func is not None:
-                        active_func(self.zone[i]["active"])
-
-                # load brightness level
-                bright_func = None
-                if i == "backlight":
-                    bright_func = getattr(self, "setBrightness", None)
-                elif 'set_' + i + '_brightness' in self.METHODS:
-                    bright_func = getattr(self, "set" + self.capitalize_first_char(i) + "Brightness", None)
-
-                if bright_func is not None:
-                    bright_func(self.zone[i]["brightness"])
+        zone_names = self._get_zone_names()
+        for i in self._ACTIVE_ZONES:
+            self._restore_zone_brightness(i, zone_names[i])
 
     def disable_brightness(self):
         """
         Set brightness to 0 and/or active state to false.
         """
-        for i in self.ZONES:
-            if self.zone[i]["present"]:
-                # set active state
-                if 'set_' + i + '_active' in self.METHODS:
-                    active_func = getattr(self, "set" + self.capitalize_first_char(i) + "Active", None)
-                    if active_func is not None:
-                        active_func(False)
-
-                # set brightness level
-                bright_func = None
-                if i == "backlight":
-                    bright_func = getattr(self, "setBrightness", None)
-                elif 'set_' + i + '_brightness' in self.METHODS:
-                    bright_func = getattr(self, "set" + self.capitalize_first_char(i) + "Brightness", None)
+        zone_names = self._get_zone_names()
+        for i in self._ACTIVE_ZONES:
+            names = zone_names[i]
+
+            # set active state
+            if names.active_func_name is not None:
+                active_func = getattr(self, names.active_func_name, None)
+                if active_func is not None:
+                    active_func(False)
 
+            # set brightness level
+            if names.bright_func_name is not None:
+                bright_func = getattr(self, names.bright_func_name, None)
                 if bright_func is not None:
                     bright_func(0)
 
+    @_profiled
     def restore_effect(self):
         """
         Set the device to the current effect
@@ -440,71 +726,55 @@ class RazerDevice(DBusService):
         This is used at launch time and can be called by applications
         that use custom matrix frames after they exit
         """
-        for i in self.ZONES:
-            if self.zone[i]["present"]:
-                # prepare the effect method name
-                # yes, we need to handle the backlight zone separately too.
-                # the backlight effect methods don't have a prefix.
-                if i == "backlight":
-                    effect_func_name = 'set' + self.capitalize_first_char(self.zone[i]["effect"])
-                else:
-                    effect_func_name = 'set' + self.handle_underscores(self.capitalize_first_char(i)) + self.capitalize_first_char(self.zone[i]["effect"])
-
-                # find the effect method
-                effect_func = getattr(self, effect_func_name, None)
-
-                # check if the effect method exists only if we didn't look for spectrum (because resetting to Spectrum when the effect is Spectrum is in vain)
-                if effect_func == None and not self.zone[i]["effect"] == "spectrum":
-                    # not found. restoring to Spectrum
-                    self.logger.info("%s: Invalid effect name %s; restoring to Spectrum.", self.__class__.__name__, effect_func_name)
-                    self.zone[i]["effect"] = 'spectrum'
-                    if i == "backlight":
-                        effect_func_name = 'setSpectrum'
-                    else:
-                        effect_func_name = 'set' + self.capitalize_first_char(i) + 'Spectrum'
-                    effect_func = getattr(self, effect_func_name, None)
-
-                # we check again here because there is a possibility the device may not even have Spectrum
-                if effect_func is not None:
-                    effect = self.zone[i]["effect"]
-                    colors = self.zone[i]["colors"]
-                    speed = self.zone[i]["speed"]
-                    wave_dir = self.zone[i]["wave_dir"]
-                    if self.get_num_arguments(effect_func) == 0:
-                        effect_func()
-                    elif self.get_num_arguments(effect_func) == 1:
-                        # there are 2 effects which require 1 argument.
-                        # these are: Starlight (Random) and Wave.
-                        if effect == 'starlightRandom':
-                            effect_func(speed)
-                        elif effect == 'wave':
-                            effect_func(wave_dir)
-                        elif effect == 'wheel':
-                            effect_func(wave_dir)
-                        elif effect == 'rippleRandomColour':
-                            # do nothing. this is handled in the ripple manager.
-                            pass
-                        else:
-                            self.logger.error("%s: Effect requires 1 argument but don't know how to handle it!", self.__class__.__name__)
-                    elif self.get_num_arguments(effect_func) == 3:
-                        effect_func(colors[0], colors[1], colors[2])
-                    elif self.get_num_arguments(effect_func) == 4:
-                        # starlight/reactive have different arguments.
-                        if effect == 'starlightSingle' or effect == 'reactive':
-                            effect_func(colors[0], colors[1], colors[2], speed)
-                        elif effect == 'ripple':
-                            # do nothing. this is handled in the ripple manager.
-                            pass
-                        else:
-                            self.logger.error("%s: Effect requires 4 arguments but don't know how to handle it!", self.__class__.__name__)
-                    elif self.get_num_arguments(effect_func) == 6:
-                        effect_func(colors[0], colors[1], colors[2], colors[3], colors[4], colors[5])
-                    elif self.get_num_arguments(effect_func) == 7:
-                        effect_func(colors[0], colors[1], colors[2], colors[3], colors[4], colors[5], speed)
-                    elif self.get_num_arguments(effect_func) == 9:
-                        effect_func(colors[0], colors[1], colors[2], colors[3], colors[4], colors[5], colors[6], colors[7], colors[8])
-                    else:
-                        self.logger.error("%s: Couldn't detect effect argument count!", self.__class__.__name__)
+        for i in self._ACTIVE_ZONES:
+            self._restore_zone_effect(i)
+
+    def _restore_zone_brightness(self, zone, names):
+        """
+        Set a zone to its current brightness/active state
+
+        :param zone: Zone
+        :type zone: str
+
+        :param names: Method names of the zone
+        :type names: _ZoneNames
+        """
+        # load active state
+        if names.active_func_name is not None:
+            active_func = getattr(self, names.active_func_name, None)
+            if active_func is not None:
+                active_func(self.zone[zone].active)
+
+        # load brightness level
+        if names.bright_func_name is not None:
+            bright_func = getattr(self, names.bright_func_name, None)
+            if bright_func is not None:
+                bright_func(self.zone[zone].brightness)
+
+    def _restore_zone_effect(self, zone):
+        """
+        Set a zone to its current effect
+
+        :param zone: Zone
+        :type zone: str
+        """
+        zone_state = self.zone[zone]
+        effect_entry = self._get_effect_entry(zone, zone_state.effect)
+
+        # check if the effect method exists only if we didn't look for spectrum (because resetting to Spectrum when the effect is Spectrum is in vain)
+        if effect_entry is None and not zone_state.effect == "spectrum":
+            # not found. restoring to Spectrum
+            effect_func_name = self._get_zone_names()[zone].effect_prefix + self.capitalize_first_char(zone_state.effect)
+            self.logger.info("%s: Invalid effect name %s; restoring to Spectrum.", self.__class__.__name__, effect_func_name)
+            zone_state.effect = 'spectrum'
+            effect_entry = self._get_effect_entry(zone, 'spectrum')
+
+        # we check again here because there is a possibility the device may not even have Spectrum
+        if effect_entry is not None:
+            if effect_entry.get_args is not None:
+                getattr(self, effect_entry.func_name)(*effect_entry.get_args(zone_state))
+            elif effect_entry.error is not None:
+                self.logger.error(effect_entry.error, self.__class__.__name__)
 
     def set_persistence(self, zone, key, value):
         """
@@ -521,7 +791,8 @@ class RazerDevice(DBusService):
         """
         if self._disable_persistence:
             return
-        self.logger.debug("Set persistence (%s, %s, %s)", zone, key, value)
+        if self._debug_logging:
+            self.logger.debug("Set persistence (%s, %s, %s)", zone, key, value)
 
         self.persistence.status["changed"] = True
 
@@ -530,358 +801,6 @@ class RazerDevice(DBusService):
         else:
             self.zone[key] = value
 
-    def get_current_effect(self):
-        """
-        Get the device's current effect
-
-        :return: Effect
-        :rtype: string
-        """
-        self.logger.debug("DBus call get_current_effect")
-
-        return self.zone["backlight"]["effect"]
-
-    def get_current_effect_colors(self):
-        """
-        Get the device's current effect's colors
-
-        :return: 3 colors
-        :rtype: list of byte
-        """
-        self.logger.debug("DBus call get_current_effect_colors")
-
-        return self.zone["backlight"]["colors"]
-
-    def get_current_effect_speed(self):
-        """
-        Get the device's current effect's speed
-
-        :return: Speed
-        :rtype: int
-        """
-        self.logger.debug("DBus call get_current_effect_speed")
-
-        return self.zone["backlight"]["speed"]
-
-    def get_current_wave_dir(self):
-        """
-        Get the device's current wave direction
-
-        :return: Direction
-        :rtype: int
-        """
-        self.logger.debug("DBus call get_current_wave_dir")
-
-        return self.zone["backlight"]["wave_dir"]
-
-    def get_current_logo_effect(self):
-        """
-        Get the device's current logo effect
-
-        :return: Effect
-        :rtype: string
-        """
-        self.logger.debug("DBus call get_current_logo_effect")
-
-        return self.zone["logo"]["effect"]
-
-    def get_current_logo_effect_colors(self):
-        """
-        Get the device's current logo effect's colors
-
-        :return: 3 colors
-        :rtype: list of byte
-        """
-        self.logger.debug("DBus call get_current_logo_effect_colors")
-
-        return self.zone["logo"]["colors"]
-
-    def get_current_logo_effect_speed(self):
-        """
-        Get the device's current logo effect's speed
-
-        :return: Speed
-        :rtype: int
-        """
-        self.logger.debug("DBus call get_current_logo_effect_speed")
-
-        return self.zone["logo"]["speed"]
-
-    def get_current_logo_wave_dir(self):
-        """
-        Get the device's current logo wave direction
-
-        :return: Direction
-        :rtype: int
-        """
-        self.logger.debug("DBus call get_current_logo_wave_dir")
-
-        return self.zone["logo"]["wave_dir"]
-
-    def get_current_scroll_effect(self):
-        """
-        Get the device's current scroll effect
-
-        :return: Effect
-        :rtype: string
-        """
-        self.logger.debug("DBus call get_current_scroll_effect")
-
-        return self.zone["scroll"]["effect"]
-
-    def get_current_scroll_effect_colors(self):
-        """
-        Get the device's current scroll effect's colors
-
-        :return: 3 colors
-        :rtype: list of byte
-        """
-        self.logger.debug("DBus call get_current_scroll_effect_colors")
-
-        return self.zone["scroll"]["colors"]
-
-    def get_current_scroll_effect_speed(self):
-        """
-        Get the device's current scroll effect's speed
-
-        :return: Speed
-        :rtype: int
-        """
-        self.logger.debug("DBus call get_current_scroll_effect_speed")
-
-        return self.zone["scroll"]["speed"]
-
-    def get_current_scroll_wave_dir(self):
-        """
-        Get the device's current scroll wave direction
-
-        :return: Direction
-        :rtype: int
-        """
-        self.logger.debug("DBus call get_current_scroll_wave_dir")
-
-        return self.zone["scroll"]["wave_dir"]
-
-    def get_current_left_effect(self):
-        """
-        Get the device's current left effect
-
-        :return: Effect
-        :rtype: string
-        """
-        self.logger.debug("DBus call get_current_left_effect")
-
-        return self.zone["left"]["effect"]
-
-    def get_current_left_effect_colors(self):
-        """
-        Get the device's current left effect's colors
-
-        :return: 3 colors
-        :rtype: list of byte
-        """
-        self.logger.debug("DBus call get_current_left_effect_colors")
-
-        return self.zone["left"]["colors"]
-
-    def get_current_left_effect_speed(self):
-        """
-        Get the device's current left effect's speed
-
-        :return: Speed
-        :rtype: int
-        """
-        self.logger.debug("DBus call get_current_left_effect_speed")
-
-        return self.zone["left"]["speed"]
-
-    def get_current_left_wave_dir(self):
-        """
-        Get the device's current left wave direction
-
-        :return: Direction
-        :rtype: int
-        """
-        self.logger.debug("DBus call get_current_left_wave_dir")
-
-        return self.zone["left"]["wave_dir"]
-
-    def get_current_right_effect(self):
-        """
-        Get the device's current right effect
-
-        :return: Effect
-        :rtype: string
-        """
-        self.logger.debug("DBus call get_current_right_effect")
-
-        return self.zone["right"]["effect"]
-
-    def get_current_right_effect_colors(self):
-        """
-        Get the device's current right effect's colors
-
-        :return: 3 colors
-        :rtype: list of byte
-        """
-        self.logger.debug("DBus call get_current_right_effect_colors")
-
-        return self.zone["right"]["colors"]
-
-    def get_current_right_effect_speed(self):
-        """
-        Get the device's current right effect's speed
-
-        :return: Speed
-        :rtype: int
-        """
-        self.logger.debug("DBus call get_current_right_effect_speed")
-
-        return self.zone["right"]["speed"]
-
-    def get_current_right_wave_dir(self):
-        """
-        Get the device's current right wave direction
-
-        :return: Direction
-        :rtype: int
-        """
-        self.logger.debug("DBus call get_current_right_wave_dir")
-
-        return self.zone["right"]["wave_dir"]
-
-    def get_current_charging_effect(self):
-        """
-        Get the device's current charging effect
-
-        :return: Effect
-        :rtype: string
-        """
-        self.logger.debug("DBus call get_current_charging_effect")
-
-        return self.zone["charging"]["effect"]
-
-    def get_current_charging_effect_colors(self):
-        """
-        Get the device's current charging effect's colors
-
-        :return: 3 colors
-        :rtype: list of byte
-        """
-        self.logger.debug("DBus call get_current_charging_effect_colors")
-
-        return self.zone["charging"]["colors"]
-
-    def get_current_charging_effect_speed(self):
-        """
-        Get the device's current charging effect's speed
-
-        :return: Speed
-        :rtype: int
-        """
-        self.logger.debug("DBus call get_current_charging_effect_speed")
-
-        return self.zone["charging"]["speed"]
-
-    def get_current_charging_wave_dir(self):
-        """
-        Get the device's current charging wave direction
-
-        :return: Direction
-        :rtype: int
-        """
-        self.logger.debug("DBus call get_current_charging_wave_dir")
-
-        return self.zone["charging"]["wave_dir"]
-
-    def get_current_fast_charging_effect(self):
-        """
-        Get the device's current fast_charging effect
-
-        :return: Effect
-        :rtype: string
-        """
-        self.logger.debug("DBus call get_current_fast_charging_effect")
-
-        return self.zone["fast_charging"]["effect"]
-
-    def get_current_fast_charging_effect_colors(self):
-        """
-        Get the device's current fast_charging effect's colors
-
-        :return: 3 colors
-        :rtype: list of byte
-        """
-        self.logger.debug("DBus call get_current_fast_charging_effect_colors")
-
-        return self.zone["fast_charging"]["colors"]
-
-    def get_current_fast_charging_effect_speed(self):
-        """
-        Get the device's current fast_charging effect's speed
-
-        :return: Speed
-        :rtype: int
-        """
-        self.logger.debug("DBus call get_current_fast_charging_effect_speed")
-
-        return self.zone["fast_charging"]["speed"]
-
-    def get_current_fast_charging_wave_dir(self):
-        """
-        Get the device's current fast_charging wave direction
-
-        :return: Direction
-        :rtype: int
-        """
-        self.logger.debug("DBus call get_current_fast_charging_wave_dir")
-
-        return self.zone["fast_charging"]["wave_dir"]
-
-    def get_current_fully_charged_effect(self):
-        """
-        Get the device's current fully_charged effect
-
-        :return: Effect
-        :rtype: string
-        """
-        self.logger.debug("DBus call get_current_fully_charged_effect")
-
-        return self.zone["fully_charged"]["effect"]
-
-    def get_current_fully_charged_effect_colors(self):
-        """
-        Get the device's current fully_charged effect's colors
-
-        :return: 3 colors
-        :rtype: list of byte
-        """
-        self.logger.debug("DBus call get_current_fully_charged_effect_colors")
-
-        return self.zone["fully_charged"]["colors"]
-
-    def get_current_fully_charged_effect_speed(self):
-        """
-        Get the device's current fully_charged effect's speed
-
-        :return: Speed
-        :rtype: int
-        """
-        self.logger.debug("DBus call get_current_fully_charged_effect_speed")
-
-        return self.zone["fully_charged"]["speed"]
-
-    def get_current_fully_charged_wave_dir(self):
-        """
-        Get the device's current fully_charged wave direction
-
-        :return: Direction
-        :rtype: int
-        """
-        self.logger.debug("DBus call get_current_fully_charged_wave_dir")
-
-        return self.zone["fully_charged"]["wave_dir"]
-
     @property
     def effect_sync(self):
         """
@@ -952,7 +871,7 @@ class RazerDevice(DBusService):
         :return: Full path to driver
         :rtype: str
         """
-        return os.path.join(self._device_path, driver_filename)
+        return self._device_path_prefix + driver_filename
 
     def get_serial(self):
         """
@@ -963,7 +882,10 @@ class RazerDevice(DBusService):
         """
         # TODO raise exception if serial can't be got and handle during device add
         if self._serial is None:
-            serial_path = os.path.join(self._device_path, 'device_serial')
+            self._serial = self._SERIAL_CACHE.get(self._device_path)
+
+        if self._serial is None:
+            serial_path = self._device_path_prefix + 'device_serial'
             count = 0
             serial = ''
             while len(serial) == 0:
@@ -992,7 +914,7 @@ class RazerDevice(DBusService):
             # - "empty (NULL)"
             # - "As printed in the D cover"
             # - hex: 01 01 01 01 05 06 07 08 09 0a 0b 0c 0d 0e 0f 10 11 12 13 14 15 16
-            if not re.fullmatch(r"[\dA-Z]+", serial):
+            if not (serial and _SERIAL_CHARS.issuperset(serial)) and not _SERIAL_RE.fullmatch(serial):
                 self.logger.warning("Invalid serial number found, using a generated one.")
                 self.logger.warning("Original value: %s" % serial)
                 vid, pid = self.get_vid_pid()
@@ -1001,6 +923,7 @@ class RazerDevice(DBusService):
                 serial = "UNKNOWN_{0:04X}{1:04X}_{2:04d}".format(vid, pid, idx)
 
             self._serial = serial.replace(' ', '_')
+            self._SERIAL_CACHE[self._device_path] = self._serial
 
         return self._serial
 
@@ -1011,19 +934,20 @@ class RazerDevice(DBusService):
         :return: String of device mode and arg separated by colon, e.g. 0:0 or 3:0
         :rtype: str
         """
-        device_mode_path = os.path.join(self._device_path, 'device_mode')
-        with open(device_mode_path, 'rb') as mode_file:
-            count = 0
-            mode = mode_file.read().strip()
-            while len(mode) == 0:
-                if count >= 3:
+        device_mode_path = self._device_path_prefix + 'device_mode'
+        mode_fd = os.open(device_mode_path, os.O_RDONLY)
+        try:
+            # The mode is 2 bytes, read from the start again if we didn't get them
+            for count in range(4):
+                if count > 0:
+                    time.sleep(0.1)
+                mode = os.pread(mode_fd, 2, 0)
+                if len(mode) >= 2:
                     break
-                mode = mode_file.read().strip()
-
-                count += 1
-                time.sleep(0.1)
+        finally:
+            os.close(mode_fd)
 
-            return "{0}:{1}".format(mode[0], mode[1])
+        return "{0}:{1}".format(mode[0], mode[1])
 
     def set_device_mode(self, mode_id, param):
         """
@@ -1032,19 +956,20 @@ class RazerDevice(DBusService):
         :param mode_id: Device mode ID
         :type mode_id: int
 
-        :param param: Device mode parameter
+        :param param: Device mode parameter, only 0 is valid
         :type param: int
         """
-        device_mode_path = os.path.join(self._device_path, 'device_mode')
+        device_mode_path = self._device_path_prefix + 'device_mode'
         with open(device_mode_path, 'wb') as mode_file:
 
-            # Do some validation (even though its in the driver)
-            if mode_id not in (0, 3):
-                mode_id = 0
-            if param != 0:
-                param = 0
+            # Do some validation (even though its in the driver),
+            # the parameter is always sent as 0 and unknown modes are
+            # set to device mode
+            payload = _MODE_PAYLOADS.get((mode_id, param))
+            if payload is None:
+                payload = _MODE_PAYLOADS.get((mode_id, 0), _MODE_PAYLOADS[(0, 0)])
 
-            mode_file.write(bytes([mode_id, param]))
+            mode_file.write(payload)
 
     def _set_custom_effect(self):
         """
@@ -1052,12 +977,9 @@ class RazerDevice(DBusService):
         """
         # self.logger.debug("DBus call _set_custom_effect")
 
-        driver_path = self.get_driver_path('matrix_effect_custom')
-
         payload = b'1'
 
-        with open(driver_path, 'wb') as driver_file:
-            driver_file.write(payload)
+        self._write_driver_file('matrix_effect_custom', payload)
 
     def _set_key_row(self, payload):
         """
@@ -1074,10 +996,45 @@ class RazerDevice(DBusService):
         """
         # self.logger.debug("DBus call set_key_row")
 
-        driver_path = self.get_driver_path('matrix_custom_frame')
+        self._write_driver_file('matrix_custom_frame', payload)
+
+    def _write_driver_file(self, driver_filename, payload):
+        """
+        Write to a driver file, keeping it open for the next write
+
+        Used for the custom frames, which are written many times a second
+        during animations.
+
+        :param driver_filename: Driver filename
+        :type driver_filename: str
+
+        :param payload: Binary payload
+        :type payload: bytes
+        """
+        with self._driver_fds_lock:
+            driver_fd = self._driver_fds.get(driver_filename)
+            if driver_fd is None:
+                driver_fd = os.open(self.get_driver_path(driver_filename), os.O_WRONLY)
+                self._driver_fds[driver_filename] = driver_fd
 
-        with open(driver_path, 'wb') as driver_file:
-            driver_file.write(payload)
+            try:
+                payload = memoryview(payload)
+                written = 0
+                while written < len(payload):
+                    count = os.pwrite(driver_fd, payload[written:], written)
+                    if count == 0:
+                        raise OSError("Could not write to " + driver_filename)
+                    written += count
+
+                # The fake driver files are regular files, don't leave the end
+                # of a longer previous payload behind
+                if self._testing:
+                    os.ftruncate(driver_fd, written)
+            except OSError:
+                # Open it again next time, e.g. if the device went away
+                if self._driver_fds.pop(driver_filename, None) == driver_fd:
+                    os.close(driver_fd)
+                raise
 
     def _init_battery_manager(self):
         """
@@ -1115,18 +1072,14 @@ class RazerDevice(DBusService):
 
         Goes through the list in self.methods_internal and self.METHODS and loads each effect and adds it to DBus
         """
-        available_functions = {}
-        methods = dir(openrazer_daemon.dbus_services.dbus_methods)
-        for method in methods:
-            potential_function = getattr(openrazer_daemon.dbus_services.dbus_methods, method)
-            if isinstance(potential_function, types.FunctionType) and hasattr(potential_function, 'endpoint') and potential_function.endpoint:
-                available_functions[potential_function.__name__] = potential_function
+        available_functions = _get_dbus_endpoints()
 
         self.methods_internal.extend(self.METHODS)
         for method_name in self.methods_internal:
             try:
                 new_function = available_functions[method_name]
-                self.logger.debug("Adding %s.%s method to DBus", new_function.interface, new_function.name)
+                if self._debug_logging:
+                    self.logger.debug("Adding %s.%s method to DBus", new_function.interface, new_function.name)
                 self.add_dbus_method(new_function.interface, new_function.name, new_function, new_function.in_sig, new_function.out_sig, new_function.byte_arrays)
             except KeyError as e:
                 raise RuntimeError("Couldn't add method to DBus: " + str(e)) from None
@@ -1136,39 +1089,44 @@ class RazerDevice(DBusService):
         Suspend device
         """
         self.logger.info("Suspending %s", self.__class__.__name__)
-        self.disable_notify = True
-        self.disable_persistence = True
-
-        self.disable_brightness()
-        self._suspend_device()
 
-        self.disable_notify = False
-        self.disable_persistence = False
+        with self._quiet():
+            self.disable_brightness()
+            self._suspend_device()
 
     def resume_device(self):
         """
         Resume device
         """
         self.logger.info("Resuming %s", self.__class__.__name__)
-        self.disable_notify = True
-        self.disable_persistence = True
-
-        # Set device back to driver mode after e.g. suspend which resets the
-        # device to default device mode.
-        # NOTE: This is really the wrong place to put this, since this callback
-        # is for screensaver unlock, and not for 'wake up from suspend' or
-        # similar. Nevertheless for now this seems to be the best place for
-        # this and should resolve some issues with macro keys not working after
-        # suspend.
-        if self.DRIVER_MODE:
-            self.logger.info('Setting device back to "driver" mode.')
-            self.set_device_mode(0x03, 0x00)  # Driver mode
 
-        self.restore_brightness()
-        self._resume_device()
+        with self._quiet():
+            # Set device back to driver mode after e.g. suspend which resets the
+            # device to default device mode.
+            # NOTE: This is really the wrong place to put this, since this callback
+            # is for screensaver unlock, and not for 'wake up from suspend' or
+            # similar. Nevertheless for now this seems to be the best place for
+            # this and should resolve some issues with macro keys not working after
+            # suspend.
+            if self.DRIVER_MODE:
+                self.logger.info('Setting device back to "driver" mode.')
+                self.set_device_mode(0x03, 0x00)  # Driver mode
+
+            self.restore_brightness()
+            self._resume_device()
 
-        self.disable_notify = False
-        self.disable_persistence = False
+    @contextlib.contextmanager
+    def _quiet(self):
+        """
+        Context manager disabling notifications and persistence, e.g. while suspending
+        """
+        self._disable_notifications = True
+        self._disable_persistence = True
+        try:
+            yield
+        finally:
+            self._disable_notifications = False
+            self._disable_persistence = False
 
     def _suspend_device(self):
         """
@@ -1195,24 +1153,29 @@ class RazerDevice(DBusService):
         Close any resources opened by subclasses
         """
         if not self._is_closed:
-            # If this is a mouse, retrieve current DPI for local storage
-            # in case the user has changed the DPI on-the-fly
-            # (e.g. the DPI buttons)
-            if 'get_dpi_xy' in self.METHODS:
-                dpi_func = getattr(self, "getDPI", None)
-                if dpi_func is not None:
-                    self.dpi = dpi_func()
-
-            if self.DRIVER_MODE:
-                # Set back to device mode
-                try:
-                    self.set_device_mode(0x00, 0x00)  # Device mode
-                except FileNotFoundError:
-                    pass
+            try:
+                # If this is a mouse, retrieve current DPI for local storage
+                # in case the user has changed the DPI on-the-fly
+                # (e.g. the DPI buttons)
+                if 'get_dpi_xy' in self._METHOD_SET:
+                    dpi_func = getattr(self, "getDPI", None)
+                    if dpi_func is not None:
+                        self.dpi = dpi_func()
+
+                if self.DRIVER_MODE:
+                    # Set back to device mode
+                    try:
+                        self.set_device_mode(0x00, 0x00)  # Device mode
+                    except FileNotFoundError:
+                        pass
 
-            self._close()
+                self._close()
+            finally:
+                # Runs the cleanup which doesn't need the device, once, even
+                # if the device went away while closing it
+                self._finalizer()
 
-            self._is_closed = True
+                self._is_closed = True
 
     def register_observer(self, observer):
         """
@@ -1221,8 +1184,7 @@ class RazerDevice(DBusService):
         :param observer: Observer
         :type observer: object
         """
-        if observer not in self._observer_list:
-            self._observer_list.append(observer)
+        self._observer_list[observer] = None
 
     def register_parent(self, parent):
         """
@@ -1240,10 +1202,7 @@ class RazerDevice(DBusService):
         :param observer: Observer
         :type observer: object
         """
-        try:
-            self._observer_list.remove(observer)
-        except ValueError:
-            pass
+        self._observer_list.pop(observer, None)
 
     def notify_observers(self, msg):
         """
@@ -1252,14 +1211,18 @@ class RazerDevice(DBusService):
         :param msg: Tuple with first element a string
         :type msg: tuple
         """
-        if not self._disable_notifications:
-            self.logger.debug("Sending observer message: %s", str(msg))
+        if self._disable_notifications:
+            return
 
-            if self._effect_sync_propagate_up and self._parent is not None:
-                self._parent.notify_parent(msg)
+        if self._debug_logging:
+            self.logger.debug("Sending observer message: %s", msg)
 
-            for observer in self._observer_list:
-                observer.notify(msg)
+        parent = self._parent
+        if self._effect_sync_propagate_up and parent is not None:
+            parent.notify_parent(msg)
+
+        for observer in self._observer_list:
+            observer.notify(msg)
 
     def notify(self, msg):
         """
@@ -1268,7 +1231,8 @@ class RazerDevice(DBusService):
         :param msg: Tuple with first element a string
         :type msg: tuple
         """
-        self.logger.debug("Got observer message: %s", str(msg))
+        if self._debug_logging:
+            self.logger.debug("Got observer message: %s", msg)
 
         for observer in self._observer_list:
             observer.notify(msg)
@@ -1287,10 +1251,11 @@ class RazerDevice(DBusService):
         :return: True if its the correct device ID
         :rtype: bool
         """
-        pattern = r'^[0-9A-F]{4}:' + '{0:04X}'.format(cls.USB_VID) + ':' + '{0:04X}'.format(cls.USB_PID) + r'\.[0-9A-F]{4}$'
+        if cls._DEVICE_ID_RE is None:
+            return False
 
-        if re.match(pattern, device_id) is not None:
-            if 'device_type' in os.listdir(dev_path):
+        if cls._DEVICE_ID_RE.match(device_id) is not None:
+            if os.path.exists(os.path.join(dev_path, 'device_type')):
                 return True
 
         return False
@@ -1306,24 +1271,199 @@ class RazerDevice(DBusService):
         :return: Number of arguments
         :rtype: int
         """
-        func_sig = inspect.signature(func)
-        return len(func_sig.parameters)
+        # Read the argument count from the code object, unless the function
+        # takes *args/**kwargs (e.g. a wrapper) or isn't a Python function
+        code = getattr(func, '__code__', None)
+        if code is None or code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS):  # pylint: disable=no-member
+            func_sig = inspect.signature(func)
+            return len(func_sig.parameters)
+
+        num_arguments = code.co_argcount + code.co_kwonlyargcount
+        # self is already bound
+        if isinstance(func, types.MethodType):
+            num_arguments -= 1
+        return num_arguments
+
+    @classmethod
+    def _get_zone_names(cls):
+        """
+        Get the names of the per-zone methods used for restoring a device
+
+        The names only depend on ZONES and METHODS, so they are built once
+        per class and then reused.
+
+        :return: Dict of zone to _ZoneNames
+        :rtype: dict
+        """
+        zone_names = cls.__dict__.get('_zone_names')
+        if zone_names is None:
+            zone_names = {}
+            for i in cls.ZONES:
+                capitalized = cls._CAP_ZONE[i]
+
+                active_func_name = None
+                if 'set_' + i + '_active' in cls._METHOD_SET:
+                    active_func_name = 'set' + capitalized + 'Active'
+
+                bright_func_name = None
+                if i == "backlight":
+                    bright_func_name = 'setBrightness'
+                elif 'set_' + i + '_brightness' in cls._METHOD_SET:
+                    bright_func_name = 'set' + capitalized + 'Brightness'
+
+                # yes, we need to handle the backlight zone separately too.
+                # the backlight effect methods don't have a prefix.
+                if i == "backlight":
+                    effect_prefix = 'set'
+                else:
+                    effect_prefix = 'set' + cls._UND_CAP_ZONE[i]
+
+                zone_names[i] = _ZoneNames(active_func_name, bright_func_name, effect_prefix)
+
+            cls._zone_names = zone_names
+
+        return zone_names
+
+    def _get_effect_entry(self, zone, effect):
+        """
+        Get how to restore an effect of a zone
+
+        The lookup of the effect method and its argument count is done once
+        per class, zone and effect and then reused.
+
+        :param zone: Zone
+        :type zone: str
+
+        :param effect: Effect name
+        :type effect: str
+
+        :return: Effect entry or None if the device doesn't have the effect
+        :rtype: _EffectEntry or None
+        """
+        effect_table = self.__class__.__dict__.get('_effect_table')
+        if effect_table is None:
+            effect_table = self.__class__._effect_table = {}
+
+        key = (zone, effect)
+        if key not in effect_table:
+            effect_func_name = self._get_zone_names()[zone].effect_prefix + self.capitalize_first_char(effect)
+            effect_func = getattr(self, effect_func_name, None)
+
+            if effect_func is None:
+                effect_table[key] = None
+            else:
+                num_arguments = self.get_num_arguments(effect_func)
+                if (num_arguments, effect) in _EFFECT_ARGS_BY_NAME:
+                    effect_table[key] = _EffectEntry(effect_func_name, _EFFECT_ARGS_BY_NAME[(num_arguments, effect)], None)
+                elif num_arguments in _EFFECT_ARGS:
+                    effect_table[key] = _EffectEntry(effect_func_name, _EFFECT_ARGS[num_arguments], None)
+                elif num_arguments == 1:
+                    effect_table[key] = _EffectEntry(effect_func_name, None, "%s: Effect requires 1 argument but don't know how to handle it!")
+                elif num_arguments == 4:
+                    effect_table[key] = _EffectEntry(effect_func_name, None, "%s: Effect requires 4 arguments but don't know how to handle it!")
+                else:
+                    effect_table[key] = _EffectEntry(effect_func_name, None, "%s: Couldn't detect effect argument count!")
+
+        return effect_table[key]
 
     @staticmethod
+    @functools.lru_cache(maxsize=512)
     def handle_underscores(string):
-        return re.sub(r'[_]+(?P<first>[a-z])', lambda m: m.group('first').upper(), string)
+        # Underscores followed by a lowercase letter are removed and the letter
+        # is uppercased, any other underscores are kept
+        parts = string.split('_')
+        result = [parts[0]]
+        underscores = 0
+        for part in parts[1:]:
+            underscores += 1
+            if not part:
+                continue
+            if 'a' <= part[0] <= 'z':
+                result.append(part[0].upper() + part[1:])
+            else:
+                result.append('_' * underscores + part)
+            underscores = 0
+        result.append('_' * underscores)
+        return ''.join(result)
 
     @staticmethod
+    @functools.lru_cache(maxsize=512)
     def capitalize_first_char(string):
-        return string[0].upper() + string[1:]
-
-    def __del__(self):
-        self.close()
+        return string[:1].upper() + string[1:]
 
     def __repr__(self):
         return "{0}:{1}".format(self.__class__.__name__, self.serial)
 
 
+def _effect_getter_name(zone, getter_suffix):
+    """
+    Get the name of an effect getter of a zone
+
+    :param zone: Zone
+    :type zone: str
+
+    :param getter_suffix: Suffix of the getter name, e.g. effect_speed
+    :type getter_suffix: str
+
+    :return: Getter name, get_current_<zone>_<getter_suffix> or get_current_<getter_suffix> for the backlight
+    :rtype: str
+    """
+    # the backlight getters don't have a prefix in their names
+    if zone == "backlight":
+        return 'get_current_' + getter_suffix
+    return 'get_current_' + zone + '_' + getter_suffix
+
+
+def _make_effect_getter(zone, getter_suffix, key):
+    """
+    Make a getter returning a value of the current effect state of a zone
+
+    The getters get copied into DBus methods (see DBusService.add_dbus_method)
+    so they have to be Python functions, the attribute lookup itself is done
+    by operator.attrgetter.
+
+    :param zone: Zone
+    :type zone: str
+
+    :param getter_suffix: Suffix of the getter name, e.g. effect_speed
+    :type getter_suffix: str
+
+    :param key: Key of the zone state
+    :type key: str
+
+    :return: Getter named according to _effect_getter_name()
+    :rtype: callable
+    """
+    name = _effect_getter_name(zone, getter_suffix)
+    get = operator.attrgetter('_zone_' + zone + '.' + key)
+
+    def getter(self):
+        return get(self)
+
+    getter.__name__ = name
+    getter.__qualname__ = 'RazerDevice.' + name
+    getter.__doc__ = "Get the device's current {0} {1}".format(zone, getter_suffix.replace('_', ' '))
+    return getter
+
+
+def _add_effect_getter_methods(cls):
+    """
+    Add the effect getters of all zones to a class
+
+    The effect getters of the zones only differ in the zone they read.
+
+    :param cls: Class
+    :type cls: type
+    """
+    for zone in _EFFECT_GETTER_INTERFACES:
+        for _, getter_suffix, key, _ in _EFFECT_GETTERS:
+            getter = _make_effect_getter(zone, getter_suffix, key)
+            setattr(cls, getter.__name__, getter)
+
+
+_add_effect_getter_methods(RazerDevice)
+
+
 class RazerDeviceBrightnessSuspend(RazerDevice):
     """
     Class for devices that have get_brightness and set_brightness
@@ -514,10 +514,11 @@ class KeyboardColour(object):
         """
         assert isinstance(row_id, int), "Row ID is not an int"
 
-        payload = bytes([row_id, 0x00, len(self.colors[row_id]) - 1])
+        row = self.colors[row_id]
+        payload = bytearray((row_id, 0x00, len(row) - 1))
 
-        for rgb in self.colors[row_id]:
-            payload += bytes(rgb)
+        for rgb in row:
+            payload.extend(rgb.get())
 
         return payload
 
@@ -528,12 +529,7 @@ class KeyboardColour(object):
         :return: Byte string of 6*67 bytes, (Row ID byte then 22 RGB bytes) * 6
         :rtype: bytearray
         """
-        payload = b''
-
-        for row in range(0, self.rows):
-            payload += self.get_row_binary(row)
-
-        return payload
+        return b''.join([self.get_row_binary(row) for row in range(0, self.rows)])
 
     def get_from_total_binary(self, binary_blob):
         """
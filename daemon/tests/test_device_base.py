@@ -0,0 +1,291 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import gc
+import itertools
+import os
+import re
+import tempfile
+import threading
+import types
+import unittest
+import unittest.mock
+import weakref
+
+import openrazer_daemon.hardware.device_base as device_base
+
+
+class ParseColorsTest(unittest.TestCase):
+    def test_valid_colors(self):
+        colors = device_base._parse_colors('1 2 3 4 5 6 7 8 9')
+
+        self.assertEqual(colors, [1, 2, 3, 4, 5, 6, 7, 8, 9])
+
+    def test_range_limits(self):
+        colors = device_base._parse_colors('0 255 0 0 255 255 0 0 255')
+
+        self.assertEqual(colors, [0, 255, 0, 0, 255, 255, 0, 0, 255])
+
+    def test_too_few_colors(self):
+        with self.assertRaises(ValueError):
+            device_base._parse_colors('1 2 3')
+
+    def test_too_many_colors(self):
+        with self.assertRaises(ValueError):
+            device_base._parse_colors('9 8 7 6 5 4 3 2 1 0')
+
+    def test_empty_colors(self):
+        with self.assertRaises(ValueError):
+            device_base._parse_colors('')
+
+    def test_color_too_large(self):
+        with self.assertRaises(ValueError):
+            device_base._parse_colors('1 2 300 4 5 6 7 8 9')
+
+    def test_color_negative(self):
+        with self.assertRaises(ValueError):
+            device_base._parse_colors('1 2 -3 4 5 6 7 8 9')
+
+    def test_not_a_number(self):
+        with self.assertRaises(ValueError):
+            device_base._parse_colors('a b')
+
+
+class HandleUnderscoresTest(unittest.TestCase):
+    def test_zone_names(self):
+        # These end up in the DBus method names, e.g. setFastChargingStatic
+        cases = {
+            'Backlight': 'Backlight',
+            'Fast_charging': 'FastCharging',
+            'Fully_charged': 'FullyCharged',
+            'Channel1': 'Channel1',
+        }
+
+        for string, expected in cases.items():
+            self.assertEqual(device_base.RazerDevice.handle_underscores(string), expected)
+
+    def test_kept_underscores(self):
+        cases = {
+            '': '',
+            '_': '_',
+            'a__b': 'aB',
+            'a_': 'a_',
+            'a_1': 'a_1',
+            'a_B': 'a_B',
+            '__a_1_b': 'A_1B',
+        }
+
+        for string, expected in cases.items():
+            self.assertEqual(device_base.RazerDevice.handle_underscores(string), expected)
+
+    def test_same_as_regex(self):
+        def regex_handle_underscores(string):
+            return re.sub(r'[_]+(?P<first>[a-z])', lambda m: m.group('first').upper(), string)
+
+        for length in range(0, 6):
+            for chars in itertools.product('_aB1\u00e9', repeat=length):
+                string = ''.join(chars)
+                self.assertEqual(device_base.RazerDevice.handle_underscores(string), regex_handle_underscores(string), string)
+
+
+class GetDeviceModeTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.device_mode_path = os.path.join(self.tmp_dir.name, 'device_mode')
+        open(self.device_mode_path, 'wb').close()
+
+        self.device = types.SimpleNamespace(_device_path_prefix=os.path.join(self.tmp_dir.name, ''))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_device_mode(self, *args):
+        with open(self.device_mode_path, 'wb') as mode_file:
+            mode_file.write(b'\x03\x00')
+
+    def test_retry_empty_read(self):
+        # The file is empty on the first read, the mode shows up while waiting to retry
+        with unittest.mock.patch('openrazer_daemon.hardware.device_base.time.sleep', side_effect=self.write_device_mode) as sleep_mock:
+            mode = device_base.RazerDevice.get_device_mode(self.device)
+
+        self.assertEqual(mode, '3:0')
+        sleep_mock.assert_called_once()
+
+    def test_no_retry(self):
+        self.write_device_mode()
+
+        with unittest.mock.patch('openrazer_daemon.hardware.device_base.time.sleep') as sleep_mock:
+            mode = device_base.RazerDevice.get_device_mode(self.device)
+
+        self.assertEqual(mode, '3:0')
+        sleep_mock.assert_not_called()
+
+
+class SetDeviceModeTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.device_mode_path = os.path.join(self.tmp_dir.name, 'device_mode')
+
+        self.device = types.SimpleNamespace(_device_path_prefix=os.path.join(self.tmp_dir.name, ''))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_payloads(self):
+        # Unknown modes are set to device mode, the parameter is always 0
+        cases = {
+            (0x00, 0x00): b'\x00\x00',
+            (0x03, 0x00): b'\x03\x00',
+            (0x03, 0x01): b'\x03\x00',
+            (0x00, 0x07): b'\x00\x00',
+            (0x02, 0x00): b'\x00\x00',
+            (0xFF, 0xFF): b'\x00\x00',
+        }
+
+        for (mode_id, param), expected in cases.items():
+            device_base.RazerDevice.set_device_mode(self.device, mode_id, param)
+
+            with open(self.device_mode_path, 'rb') as mode_file:
+                self.assertEqual(mode_file.read(), expected, (mode_id, param))
+
+
+class _DriverFilesDevice:
+    """
+    Just enough of a device to write driver files and close it
+    """
+    _METHOD_SET = frozenset()
+    DRIVER_MODE = False
+
+    get_driver_path = device_base.RazerDevice.get_driver_path
+    _write_driver_file = device_base.RazerDevice._write_driver_file
+    close = device_base.RazerDevice.close
+
+    def __init__(self, device_path):
+        self._device_path_prefix = os.path.join(device_path, '')
+        self._testing = True
+        self._is_closed = False
+        self._driver_fds = {}
+        self._driver_fds_lock = threading.Lock()
+        self._finalizer = weakref.finalize(self, device_base._finalize_device, self._driver_fds, self._driver_fds_lock, device_path)
+
+    def _close(self):
+        pass
+
+
+class WriteDriverFileTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.driver_path = os.path.join(self.tmp_dir.name, 'matrix_custom_frame')
+        open(self.driver_path, 'wb').close()
+
+        self.device = _DriverFilesDevice(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.device.close()
+        self.tmp_dir.cleanup()
+
+    def read_driver_file(self):
+        with open(self.driver_path, 'rb') as driver_file:
+            return driver_file.read()
+
+    def assert_fd_closed(self, driver_fd):
+        with self.assertRaises(OSError):
+            os.fstat(driver_fd)
+
+    def test_write(self):
+        self.device._write_driver_file('matrix_custom_frame', b'\x01\x02\x03')
+
+        self.assertEqual(self.read_driver_file(), b'\x01\x02\x03')
+        self.assertIn('matrix_custom_frame', self.device._driver_fds)
+
+    def test_fd_kept_open(self):
+        self.device._write_driver_file('matrix_custom_frame', b'\x01')
+        driver_fd = self.device._driver_fds['matrix_custom_frame']
+        self.device._write_driver_file('matrix_custom_frame', b'\x02')
+
+        self.assertEqual(self.device._driver_fds['matrix_custom_frame'], driver_fd)
+        self.assertEqual(self.read_driver_file(), b'\x02')
+
+    def test_shorter_payload(self):
+        # The fake driver files are regular files, the end of the longer payload must not be left behind
+        self.device._write_driver_file('matrix_custom_frame', bytes(range(20)))
+        self.device._write_driver_file('matrix_custom_frame', b'\xff\xfe\xfd')
+
+        self.assertEqual(self.read_driver_file(), b'\xff\xfe\xfd')
+
+    def test_short_writes(self):
+        real_pwrite = os.pwrite
+
+        def pwrite_one_byte(driver_fd, data, offset):
+            return real_pwrite(driver_fd, data[:1], offset)
+
+        with unittest.mock.patch('openrazer_daemon.hardware.device_base.os.pwrite', side_effect=pwrite_one_byte) as pwrite_mock:
+            self.device._write_driver_file('matrix_custom_frame', b'\x01\x02\x03\x04')
+
+        self.assertEqual(self.read_driver_file(), b'\x01\x02\x03\x04')
+        self.assertEqual(pwrite_mock.call_count, 4)
+
+    def test_nothing_written(self):
+        with unittest.mock.patch('openrazer_daemon.hardware.device_base.os.pwrite', return_value=0):
+            with self.assertRaises(OSError):
+                self.device._write_driver_file('matrix_custom_frame', b'\x01')
+
+        self.assertNotIn('matrix_custom_frame', self.device._driver_fds)
+
+    def test_failed_write_reopens(self):
+        # Writing to a read only fd fails like a device that went away
+        read_fd = os.open(self.driver_path, os.O_RDONLY)
+        self.device._driver_fds['matrix_custom_frame'] = read_fd
+
+        with self.assertRaises(OSError):
+            self.device._write_driver_file('matrix_custom_frame', b'\x01')
+
+        self.assertNotIn('matrix_custom_frame', self.device._driver_fds)
+        self.assert_fd_closed(read_fd)
+
+        self.device._write_driver_file('matrix_custom_frame', b'\x02\x03')
+
+        self.assertEqual(self.read_driver_file(), b'\x02\x03')
+        self.assertIn('matrix_custom_frame', self.device._driver_fds)
+
+    def test_missing_file(self):
+        os.remove(self.driver_path)
+
+        with self.assertRaises(FileNotFoundError):
+            self.device._write_driver_file('matrix_custom_frame', b'\x01')
+
+        self.assertEqual(self.device._driver_fds, {})
+
+    def test_close(self):
+        self.device._write_driver_file('matrix_custom_frame', b'\x01')
+        driver_fd = self.device._driver_fds['matrix_custom_frame']
+
+        self.device.close()
+
+        self.assertEqual(self.device._driver_fds, {})
+        self.assert_fd_closed(driver_fd)
+        self.assertFalse(self.device._finalizer.alive)
+
+    def test_close_failing(self):
+        self.device._write_driver_file('matrix_custom_frame', b'\x01')
+        driver_fd = self.device._driver_fds['matrix_custom_frame']
+
+        with unittest.mock.patch.object(self.device, '_close', side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.device.close()
+
+        self.assert_fd_closed(driver_fd)
+        self.assertTrue(self.device._is_closed)
+
+    def test_garbage_collected(self):
+        self.device._write_driver_file('matrix_custom_frame', b'\x01')
+        driver_fds = self.device._driver_fds
+        driver_fd = driver_fds['matrix_custom_frame']
+
+        # The finalizer runs once the device is gone, without close()
+        finalizer = self.device._finalizer
+        self.device = _DriverFilesDevice(self.tmp_dir.name)
+        gc.collect()
+
+        self.assertFalse(finalizer.alive)
+        self.assertEqual(driver_fds, {})
+        self.assert_fd_closed(driver_fd)